@@ -6,8 +6,10 @@ position sizing, and PnL tracking for EUR/USD.
 
 import numpy as np
 import pandas as pd
-from dataclasses import dataclass, field
-from typing import List
+from dataclasses import dataclass, replace
+from itertools import product
+
+from src.backtest_numba import NUMBA_AVAILABLE, _grid, _run_core, rolling_max_deque
 
 
 @dataclass
@@ -21,17 +23,39 @@ class BacktestConfig:
     leverage: float = 1.0               # leverage multiplier
 
 
-@dataclass
-class Trade:
-    """Records a single trade."""
-    date: pd.Timestamp
-    direction: int          # +1 long, -1 short
-    entry_price: float
-    exit_price: float
-    stop_loss_price: float
-    pnl_usd: float
-    stopped_out: bool
-    position_size: float    # in base currency (EUR)
+LOOKBACK_DD_WINDOW = 125  # ~6 months of trading days
+
+
+def _run_core_numpy(signals, opens, highs, lows, closes,
+                    init_cap, pos_pct, sl_pct, tc, lev):
+    """
+    Vectorized NumPy fallback for backtest_numba._run_core.
+
+    Returns (direction, entry, exit, stop, pnl, stopped, position, equity) arrays,
+    with the same dtypes as the Numba kernel.
+    """
+    # Stop-loss levels: LONG stops below entry, SHORT stops above
+    is_long = signals == 1
+    direction = np.where(is_long, 1, -1).astype(np.int8)
+    stop_price = np.where(is_long, opens * (1 - sl_pct), opens * (1 + sl_pct))
+    stopped_out = np.where(is_long, lows <= stop_price, highs >= stop_price)
+    actual_exit = np.where(stopped_out, stop_price, closes)  # default: EOD exit
+    price_move = direction * (actual_exit - opens) - tc
+
+    # Position value is a fixed fraction of running capital, so capital
+    # compounds multiplicatively: C_t = C_{t-1} * (1 + pct * lev * move / entry)
+    exposure = pos_pct * lev
+    growth = 1.0 + exposure * price_move / opens
+    equity = init_cap * np.cumprod(growth)
+    capital_before = np.concatenate(([init_cap], equity[:-1]))
+
+    # Position size in EUR
+    position_size = capital_before * exposure / opens
+    pnl_usd = position_size * price_move
+
+    # Stored prices are float32: 5-decimal EUR/USD quotes fit with margin
+    prices = (a.astype(np.float32) for a in (opens, actual_exit, stop_price))
+    return (direction, *prices, pnl_usd, stopped_out, position_size, equity)
 
 
 def run_backtest(df: pd.DataFrame, config: BacktestConfig = None) -> dict:
@@ -45,133 +69,236 @@ def run_backtest(df: pd.DataFrame, config: BacktestConfig = None) -> dict:
       - Exit at close of T+1 if not stopped out
 
     Returns a dict with:
-      - trades: list of Trade objects
-      - equity_curve: pd.Series
-      - metrics: dict of performance metrics
+      - trades: pd.DataFrame, one row per trade (bars with ML_Signal == 0 are skipped)
+      - equity: pd.DataFrame of daily equity, indexed by Date
+      - rolling_max / drawdown: running equity peak and drawdown, pd.Series
+      - metrics: dict of performance metrics, name -> (display, value)
+      - config: the BacktestConfig used
+    """
+    if config is None:
+        config = BacktestConfig()
+
+    signals, opens, highs, lows, closes, dates, trade_idx = _prepare_arrays(df)
+
+    core = _run_core if NUMBA_AVAILABLE else _run_core_numpy
+    arrays = core(
+        signals, opens, highs, lows, closes,
+        config.initial_capital, config.position_size_pct,
+        config.stop_loss_pct, _transaction_cost(config), config.leverage,
+    )
+    return _build_result(dates, trade_idx, arrays, config)
+
+
+def run_backtest_grid(df: pd.DataFrame, sl_grid, pos_grid, lev_grid,
+                      config: BacktestConfig = None) -> list:
+    """
+    Run one backtest per (stop_loss, position, leverage) combination.
+
+    The OHLC and signal arrays are extracted once and shared by every
+    combination. With Numba installed the combinations run in parallel.
+
+    Returns a list of result dicts (same layout as run_backtest), in
+    itertools.product(sl_grid, pos_grid, lev_grid) order.
     """
     if config is None:
         config = BacktestConfig()
 
-    trades: List[Trade] = []
-    capital = config.initial_capital
-    equity_curve = []
+    configs = [
+        replace(config, stop_loss_pct=sl, position_size_pct=pos, leverage=lev)
+        for sl, pos, lev in product(sl_grid, pos_grid, lev_grid)
+    ]
+    signals, opens, highs, lows, closes, dates, trade_idx = _prepare_arrays(df)
+    tc = _transaction_cost(config)
+
+    if NUMBA_AVAILABLE:
+        grid = _grid(
+            signals, opens, highs, lows, closes, config.initial_capital,
+            np.array([c.position_size_pct for c in configs], dtype=np.float64),
+            np.array([c.stop_loss_pct for c in configs], dtype=np.float64),
+            tc,
+            np.array([c.leverage for c in configs], dtype=np.float64),
+        )
+        runs = [tuple(out[k] for out in grid) for k in range(len(configs))]
+    else:
+        runs = [
+            _run_core_numpy(signals, opens, highs, lows, closes, c.initial_capital,
+                            c.position_size_pct, c.stop_loss_pct, tc, c.leverage)
+            for c in configs
+        ]
+
+    return [_build_result(dates, trade_idx, arrays, c) for arrays, c in zip(runs, configs)]
+
+
+def _transaction_cost(config: BacktestConfig) -> float:
+    """Spread cost per trade, in price terms."""
     pip = 0.0001
-    transaction_cost = config.transaction_cost_pips * pip
-
-    # We need next-day OHLC to simulate stop-loss
-    # Signal day is T, trade day is T+1
-    for i in range(len(df) - 1):
-        row = df.iloc[i]
-        next_row = df.iloc[i + 1]
-
-        signal = row['ML_Signal']
-
-        # Entry at next day open
-        entry_price = next_row['Open']
-        high = next_row['High']
-        low = next_row['Low']
-        exit_price = next_row['Close']  # default: EOD exit
-
-        # Position size in EUR
-        position_value = capital * config.position_size_pct * config.leverage
-        position_size = position_value / entry_price
-
-        # Stop-loss levels
-        if signal == 1:  # LONG
-            stop_price = entry_price * (1 - config.stop_loss_pct)
-            stopped_out = low <= stop_price
-            actual_exit = stop_price if stopped_out else exit_price
-            price_move = actual_exit - entry_price - transaction_cost
-        else:  # SHORT
-            stop_price = entry_price * (1 + config.stop_loss_pct)
-            stopped_out = high >= stop_price
-            actual_exit = stop_price if stopped_out else exit_price
-            price_move = entry_price - actual_exit - transaction_cost
-
-        pnl_usd = position_size * price_move
-        capital += pnl_usd
-
-        trades.append(Trade(
-            date=next_row['Date'],
-            direction=signal,
-            entry_price=entry_price,
-            exit_price=actual_exit,
-            stop_loss_price=stop_price,
-            pnl_usd=pnl_usd,
-            stopped_out=stopped_out,
-            position_size=position_size,
-        ))
-
-        equity_curve.append({'Date': next_row['Date'], 'Equity': capital})
-
-    equity_df = pd.DataFrame(equity_curve).set_index('Date')
-
-    trades_df = pd.DataFrame([
-        {
-            'Date': t.date,
-            'Direction': 'LONG' if t.direction == 1 else 'SHORT',
-            'Entry': t.entry_price,
-            'Exit': t.exit_price,
-            'Stop_Loss': t.stop_loss_price,
-            'PnL_USD': t.pnl_usd,
-            'Stopped_Out': t.stopped_out,
-            'Position_EUR': t.position_size,
-        }
-        for t in trades
-    ])
-
-    metrics = compute_metrics(trades_df, equity_df, config)
+    return config.transaction_cost_pips * pip
+
+
+def _prepare_arrays(df: pd.DataFrame):
+    """
+    Extract kernel inputs from the signal DataFrame.
+
+    Signal day is T, trade day is T+1: signals come from every row but the
+    last, OHLC and dates from every row but the first.
+
+    Bars with ML_Signal == 0 are not traded, so signals and OHLC are sliced
+    down to trade_idx (positions of the traded bars within dates).
+    """
+    signals = df['ML_Signal'].to_numpy()[:-1]
+    # One contiguous array per column (a 2-D block's .T rows would be strided)
+    opens, highs, lows, closes = (
+        df[col].to_numpy(dtype=np.float64)[1:] for col in ('Open', 'High', 'Low', 'Close')
+    )
+    dates = df['Date'].to_numpy()[1:]
+
+    trade_idx = np.flatnonzero(signals != 0)
+    if len(trade_idx) < len(signals):
+        signals, opens, highs, lows, closes = (
+            a[trade_idx] for a in (signals, opens, highs, lows, closes)
+        )
+    return signals, opens, highs, lows, closes, dates, trade_idx
+
+
+def _expand_equity(trade_equity, trade_idx, n_bars: int, init_cap: float):
+    """
+    Spread per-trade equity back onto every bar: no-trade bars carry the
+    equity of the last trade before them (initial capital before the first).
+    """
+    if len(trade_idx) == n_bars:
+        return trade_equity
+    last_trade = np.zeros(n_bars, dtype=np.int64)
+    last_trade[trade_idx] = np.arange(1, len(trade_idx) + 1)
+    np.maximum.accumulate(last_trade, out=last_trade)
+    return np.concatenate(([init_cap], trade_equity))[last_trade]
+
+
+def _build_result(dates, trade_idx, arrays, config: BacktestConfig) -> dict:
+    """Wrap kernel output arrays into the trades/equity frames and metrics."""
+    (direction, entry, actual_exit, stop_price,
+     pnl_usd, stopped_out, position_size, trade_equity) = arrays
+    equity = _expand_equity(trade_equity, trade_idx, len(dates), config.initial_capital)
+
+    # Column-wise construction from the preallocated arrays: no per-row objects
+    equity_df = pd.DataFrame({'Equity': equity}, index=pd.Index(dates, name='Date'))
+
+    trades_df = pd.DataFrame({
+        'Date': dates[trade_idx],
+        'Direction': np.where(direction == 1, 'LONG', 'SHORT'),
+        'Entry': entry,
+        'Exit': actual_exit,
+        'Stop_Loss': stop_price,
+        'PnL_USD': pnl_usd,
+        'Stopped_Out': stopped_out,
+        'Position_EUR': position_size,
+    })
+
+    # Running peak and drawdown are computed once here, straight from the kernel's
+    # equity array, and shared by compute_metrics and the plots
+    peak, dd = _drawdown_arrays(equity)
+    rolling_max = pd.Series(peak, index=equity_df.index, name='Rolling_Max')
+    drawdown = pd.Series(dd, index=equity_df.index, name='Drawdown')
+    metrics = compute_metrics(trades_df, equity_df, config, drawdown=drawdown)
 
     return {
         'trades': trades_df,
         'equity': equity_df,
+        'rolling_max': rolling_max,
+        'drawdown': drawdown,
         'metrics': metrics,
         'config': config,
     }
 
 
-def compute_metrics(trades_df: pd.DataFrame, equity_df: pd.DataFrame, config: BacktestConfig) -> dict:
-    """Compute standard performance metrics."""
+def _drawdown_arrays(equity_vals: np.ndarray):
+    """Running peak and fractional drawdown of an equity array, in one pass."""
+    peak = np.maximum.accumulate(equity_vals)
+    return peak, (equity_vals - peak) / peak
+
+
+def compute_drawdown(equity: pd.Series):
+    """Running peak and fractional drawdown of an equity series."""
+    peak, dd = _drawdown_arrays(equity.to_numpy())
+    rolling_max = pd.Series(peak, index=equity.index, name='Rolling_Max')
+    drawdown = pd.Series(dd, index=equity.index, name='Drawdown')
+    return rolling_max, drawdown
+
+
+def compute_rolling_drawdown(equity: pd.Series, window: int = LOOKBACK_DD_WINDOW) -> pd.Series:
+    """Drawdown from the trailing `window`-bar peak rather than the all-time peak."""
+    equity_vals = equity.to_numpy(dtype=np.float64)
+    if NUMBA_AVAILABLE:
+        peak = rolling_max_deque(equity_vals, window)
+    else:
+        peak = equity.rolling(window, min_periods=1).max().to_numpy()
+    return pd.Series((equity_vals - peak) / peak, index=equity.index, name='Rolling_Drawdown')
+
+
+def compute_metrics(trades_df: pd.DataFrame, equity_df: pd.DataFrame, config: BacktestConfig,
+                    drawdown: pd.Series = None) -> dict:
+    """
+    Compute standard performance metrics.
+
+    Returns {name: (display, value)}, where display is the formatted string
+    and value the raw float, so callers never need to parse the display text.
+    Pass a precomputed drawdown series (see compute_drawdown) to skip recomputing it.
+    """
     pnl = trades_df['PnL_USD']
     equity = equity_df['Equity']
+    equity_vals = equity.to_numpy()
 
     total_trades = len(trades_df)
-    winners = (pnl > 0).sum()
-    losers = (pnl <= 0).sum()
+    pnl_vals = pnl.to_numpy()
+    is_win = pnl_vals > 0
+    winners = int(is_win.sum())
+    losers = total_trades - winners
     win_rate = winners / total_trades if total_trades > 0 else 0
 
-    total_pnl = pnl.sum()
-    avg_win = pnl[pnl > 0].mean() if winners > 0 else 0
-    avg_loss = pnl[pnl <= 0].mean() if losers > 0 else 0
-    profit_factor = (pnl[pnl > 0].sum() / abs(pnl[pnl <= 0].sum())) if losers > 0 else np.inf
+    win_sum = pnl_vals[is_win].sum()
+    loss_sum = pnl_vals[~is_win].sum()
+    total_pnl = win_sum + loss_sum
+    avg_win = win_sum / winners if winners > 0 else 0
+    avg_loss = loss_sum / losers if losers > 0 else 0
+    profit_factor = (win_sum / abs(loss_sum)) if losers > 0 else np.inf
 
     # Drawdown
-    rolling_max = equity.cummax()
-    drawdown = (equity - rolling_max) / rolling_max
+    if drawdown is None:
+        _, drawdown = compute_drawdown(equity)
     max_drawdown = drawdown.min()
+    lookback_drawdown = compute_rolling_drawdown(equity).min()
 
     # Sharpe ratio (annualized, assuming ~252 trading days)
-    daily_returns = equity.pct_change().dropna()
-    sharpe = (daily_returns.mean() / daily_returns.std()) * np.sqrt(252) if daily_returns.std() > 0 else 0
+    daily_returns = equity_vals[1:] / equity_vals[:-1] - 1
+    std_r = daily_returns.std(ddof=1) if len(daily_returns) > 1 else 0
+    sharpe = (daily_returns.mean() / std_r) * np.sqrt(252) if std_r > 0 else 0
 
     # Calmar ratio
-    annual_return = (equity.iloc[-1] / equity.iloc[0]) ** (252 / len(equity)) - 1
+    annual_return = (equity_vals[-1] / equity_vals[0]) ** (252 / len(equity_vals)) - 1
     calmar = annual_return / abs(max_drawdown) if max_drawdown != 0 else np.inf
 
-    stop_outs = trades_df['Stopped_Out'].sum()
+    stop_outs = int(trades_df['Stopped_Out'].sum())
+
+    stop_out_rate = stop_outs / total_trades if total_trades > 0 else 0
+    total_return = equity_vals[-1] / config.initial_capital - 1
 
     return {
-        'Total Trades': total_trades,
-        'Win Rate': f'{win_rate:.1%}',
-        'Total PnL (USD)': f'{total_pnl:,.2f}',
-        'Total Return': f'{(equity.iloc[-1] / config.initial_capital - 1):.2%}',
-        'Annualized Return': f'{annual_return:.2%}',
-        'Max Drawdown': f'{max_drawdown:.2%}',
-        'Sharpe Ratio': f'{sharpe:.2f}',
-        'Calmar Ratio': f'{calmar:.2f}',
-        'Profit Factor': f'{profit_factor:.2f}',
-        'Avg Win (USD)': f'{avg_win:,.2f}',
-        'Avg Loss (USD)': f'{avg_loss:,.2f}',
-        'Stop-outs': stop_outs,
-        'Stop-out Rate': f'{stop_outs / total_trades:.1%}',
+        'Total Trades':      _metric(total_trades, 'd'),
+        'Win Rate':          _metric(win_rate, '.1%'),
+        'Total PnL (USD)':   _metric(total_pnl, ',.2f'),
+        'Total Return':      _metric(total_return, '.2%'),
+        'Annualized Return': _metric(annual_return, '.2%'),
+        'Max Drawdown':      _metric(max_drawdown, '.2%'),
+        '6mo Max Drawdown':  _metric(lookback_drawdown, '.2%'),
+        'Sharpe Ratio':      _metric(sharpe, '.2f'),
+        'Calmar Ratio':      _metric(calmar, '.2f'),
+        'Profit Factor':     _metric(profit_factor, '.2f'),
+        'Avg Win (USD)':     _metric(avg_win, ',.2f'),
+        'Avg Loss (USD)':    _metric(avg_loss, ',.2f'),
+        'Stop-outs':         _metric(stop_outs, 'd'),
+        'Stop-out Rate':     _metric(stop_out_rate, '.1%'),
     }
+
+
+def _metric(value, fmt: str):
+    """A metric record: (display string, numeric value)."""
+    return format(value, fmt), float(value)
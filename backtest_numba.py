@@ -0,0 +1,139 @@
+"""
+Numba Kernels
+Compiled inner loops for the backtesting engine.
+
+Numba is optional: when it is not installed, NUMBA_AVAILABLE is False,
+the decorators below become no-ops and callers in backtest.py fall back
+to their NumPy implementations.
+"""
+
+import numpy as np
+
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:  # pragma: no cover - depends on the environment
+    NUMBA_AVAILABLE = False
+    prange = range
+
+    def njit(*args, **kwargs):
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda func: func
+
+
+@njit(cache=True, fastmath=True)
+def _run_core(signals, opens, highs, lows, closes,
+              init_cap, pos_pct, sl_pct, tc, lev):
+    """
+    Signal-to-PnL loop over next-day bars.
+
+    Capital is path-dependent (position value is a fraction of running
+    capital), so bars are processed serially.
+
+    Returns (direction, entry, exit, stop, pnl, stopped, position, equity)
+    arrays, preallocated and filled in place. Arithmetic is float64; the
+    stored entry/exit/stop prices are float32.
+    """
+    n = len(signals)
+    direction = np.empty(n, dtype=np.int8)
+    entry = np.empty(n, dtype=np.float32)
+    exit_ = np.empty(n, dtype=np.float32)
+    stop = np.empty(n, dtype=np.float32)
+    pnl = np.empty(n, dtype=np.float64)
+    stopped = np.empty(n, dtype=np.bool_)
+    position = np.empty(n, dtype=np.float64)
+    equity = np.empty(n, dtype=np.float64)
+
+    capital = init_cap
+    for i in range(n):
+        entry_price = opens[i]
+        position_size = capital * pos_pct * lev / entry_price
+
+        if signals[i] == 1:  # LONG
+            stop_price = entry_price * (1 - sl_pct)
+            stopped_out = lows[i] <= stop_price
+            actual_exit = stop_price if stopped_out else closes[i]
+            price_move = actual_exit - entry_price - tc
+        else:  # SHORT
+            stop_price = entry_price * (1 + sl_pct)
+            stopped_out = highs[i] >= stop_price
+            actual_exit = stop_price if stopped_out else closes[i]
+            price_move = entry_price - actual_exit - tc
+
+        pnl_usd = position_size * price_move
+        capital += pnl_usd
+
+        direction[i] = 1 if signals[i] == 1 else -1
+        entry[i] = entry_price
+        exit_[i] = actual_exit
+        stop[i] = stop_price
+        pnl[i] = pnl_usd
+        stopped[i] = stopped_out
+        position[i] = position_size
+        equity[i] = capital
+
+    return direction, entry, exit_, stop, pnl, stopped, position, equity
+
+
+@njit(cache=True, parallel=True)
+def _grid(signals, opens, highs, lows, closes,
+          init_cap, pos_arr, sl_arr, tc, lev_arr):
+    """
+    Run _run_core once per parameter set, in parallel.
+
+    Each (pos_arr[k], sl_arr[k], lev_arr[k]) backtest is independent, so the
+    outer loop is a prange. Outputs are (K, N) matrices, one row per set, in
+    the same order as _run_core.
+    """
+    n_sets = len(sl_arr)
+    n = len(signals)
+    direction = np.empty((n_sets, n), dtype=np.int8)
+    entry = np.empty((n_sets, n), dtype=np.float32)
+    exit_ = np.empty((n_sets, n), dtype=np.float32)
+    stop = np.empty((n_sets, n), dtype=np.float32)
+    pnl = np.empty((n_sets, n), dtype=np.float64)
+    stopped = np.empty((n_sets, n), dtype=np.bool_)
+    position = np.empty((n_sets, n), dtype=np.float64)
+    equity = np.empty((n_sets, n), dtype=np.float64)
+
+    for k in prange(n_sets):
+        d, e, x, s, p, so, ps, eq = _run_core(
+            signals, opens, highs, lows, closes,
+            init_cap, pos_arr[k], sl_arr[k], tc, lev_arr[k],
+        )
+        direction[k] = d
+        entry[k] = e
+        exit_[k] = x
+        stop[k] = s
+        pnl[k] = p
+        stopped[k] = so
+        position[k] = ps
+        equity[k] = eq
+
+    return direction, entry, exit_, stop, pnl, stopped, position, equity
+
+
+@njit(cache=True)
+def rolling_max_deque(x, w):
+    """
+    Trailing maximum of x over a window of w bars (current bar included).
+
+    Monotonic deque of indices: values in the deque are decreasing, so the
+    head is always the window maximum. Each index is pushed and popped at
+    most once, giving O(N) regardless of w.
+    """
+    n = len(x)
+    out = np.empty(n, dtype=np.float64)
+    dq = np.empty(n, dtype=np.int64)  # every index is pushed once, so n slots suffice
+    head = 0
+    tail = 0  # one past the last element
+    for i in range(n):
+        while tail > head and x[dq[tail - 1]] <= x[i]:
+            tail -= 1
+        dq[tail] = i
+        tail += 1
+        if dq[head] <= i - w:
+            head += 1
+        out[i] = x[dq[head]]
+    return out
@@ -7,33 +7,38 @@ import pandas as pd
 import numpy as np
 
 
-def load_eurusd(filepath: str) -> pd.DataFrame:
-    """Load EUR/USD CSV with French locale formatting."""
-    df = pd.read_csv(filepath, sep=',', encoding='utf-8-sig')
-
-    # Rename columns
-    df.columns = ['Date', 'Close', 'Open', 'High', 'Low', 'Change_pct']
-
-    # Parse date (format: DD/MM/YYYY)
-    df['Date'] = pd.to_datetime(df['Date'], format='%d/%m/%Y')
-    df = df.sort_values('Date').reset_index(drop=True)
+def _parse_pct(value: str) -> float:
+    """Parse a French-formatted percentage such as '-0,31%'."""
+    return float(value.rstrip('%').replace(',', '.'))
 
-    # Convert French number format (comma decimal) to float
-    for col in ['Close', 'Open', 'High', 'Low']:
-        df[col] = df[col].astype(str).str.replace(',', '.').str.replace('"', '').astype(float)
 
-    # Parse Change_pct
-    df['Change_pct'] = (
-        df['Change_pct'].astype(str)
-        .str.replace('%', '')
-        .str.replace(',', '.')
-        .str.replace('"', '')
-        .astype(float)
+def load_eurusd(filepath: str) -> pd.DataFrame:
+    """Load EUR/USD CSV with French locale formatting."""
+    # French number format (comma decimal, quoted fields) is parsed by the
+    # C reader directly; only Change_pct needs its '%' suffix stripped.
+    df = pd.read_csv(
+        filepath,
+        sep=',',
+        decimal=',',
+        quotechar='"',
+        encoding='utf-8-sig',
+        header=0,
+        names=['Date', 'Close', 'Open', 'High', 'Low', 'Change_pct'],
+        dtype={col: np.float64 for col in ['Close', 'Open', 'High', 'Low']},
+        converters={'Change_pct': _parse_pct},
+        parse_dates=['Date'],
+        date_format='%d/%m/%Y',
     )
+    df = df.sort_values('Date').reset_index(drop=True)
 
-    # Compute log returns
-    df['Return'] = df['Close'].pct_change()
-    df['Log_Return'] = np.log(df['Close'] / df['Close'].shift(1))
+    # Simple and log returns in one pass over Close: log(1 + r) == log(C_t / C_{t-1})
+    close = df['Close'].to_numpy()
+    ret = np.empty_like(close)
+    ret[0] = np.nan
+    np.divide(close[1:], close[:-1], out=ret[1:])
+    ret[1:] -= 1.0
+    df['Return'] = ret
+    df['Log_Return'] = np.log1p(ret)
 
     df = df.dropna().reset_index(drop=True)
     return df
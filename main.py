@@ -3,18 +3,70 @@ main.py — Entry point for EUR/USD ML Signal Backtesting
 Usage:
     python main.py
     python main.py --accuracy 0.55 --stop-loss 0.003 --capital 50000
+    python main.py --sweep sl=0.003,0.005,0.007 pos=0.05,0.10
 """
 
 import argparse
 import os
 import sys
 
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pacsv
+except ImportError:  # optional: fall back to DataFrame.to_csv
+    pa = None
+
 sys.path.insert(0, os.path.dirname(__file__))
 
 from src.data_loader import load_eurusd
 from src.signal_simulator import simulate_ml_signal
-from src.backtest import BacktestConfig, run_backtest
-from src.plot import plot_full_report
+from src.backtest import BacktestConfig, run_backtest, run_backtest_grid
+from src.plot import new_report_figure, plot_full_report
+
+SWEEP_KEYS = ('sl', 'pos', 'lev')
+
+
+def parse_sweep(specs, args) -> dict:
+    """
+    Parse --sweep specs like ['sl=0.003,0.005', 'pos=0.1,0.2'] into grids.
+    Parameters that are not swept keep their single CLI value.
+    """
+    grids = {'sl': [args.stop_loss], 'pos': [args.position], 'lev': [args.leverage]}
+    for spec in specs:
+        key, sep, values = spec.partition('=')
+        if not sep or key not in SWEEP_KEYS:
+            raise argparse.ArgumentTypeError(
+                f'invalid sweep spec {spec!r} (expected one of {", ".join(SWEEP_KEYS)}=v1,v2,...)'
+            )
+        grids[key] = [float(v) for v in values.split(',')]
+    return grids
+
+
+def save_csv(df: pd.DataFrame, path: str, index: bool = False):
+    """Write df to CSV with pyarrow's multithreaded writer if installed, else pandas."""
+    if pa is None:
+        df.to_csv(path, index=index)
+        return
+    frame = df.reset_index() if index else df
+    table = pa.Table.from_pandas(frame, preserve_index=False)
+    # Like pandas, write all-midnight timestamps (daily bars) as plain dates
+    for i, name in enumerate(table.column_names):
+        col = frame[name]
+        if pd.api.types.is_datetime64_any_dtype(col) and (col == col.dt.normalize()).all():
+            table = table.set_column(i, name, table.column(i).cast(pa.date32()))
+    pacsv.write_csv(table, path)
+
+
+def save_table(df: pd.DataFrame, path: str, fmt: str = 'csv', index: bool = False) -> str:
+    """Write df as CSV or Parquet; path's .csv extension is swapped for .parquet."""
+    if fmt == 'parquet':
+        path = path.replace('.csv', '.parquet')
+        df.to_parquet(path, engine='pyarrow', compression='snappy', index=index)
+    else:
+        save_csv(df, path, index=index)
+    return path
 
 
 def main():
@@ -27,8 +79,23 @@ def main():
     parser.add_argument('--leverage',   type=float, default=1.0)
     parser.add_argument('--seed',       type=int,   default=42)
     parser.add_argument('--output',     default='results/backtest_report.png')
+    parser.add_argument('--sweep',      nargs='+', metavar='KEY=V1,V2',
+                        help='Parameter grid, e.g. sl=0.003,0.005 pos=0.05,0.1 lev=1,2')
+    parser.add_argument('--sweep-reports', action='store_true',
+                        help='With --sweep, also save a draft chart per combination')
+    parser.add_argument('--draft',      action='store_true', help='Smaller, lower-dpi report chart')
+    parser.add_argument('--output-format', choices=('csv', 'parquet'), default='csv',
+                        help='Format for trades/equity/sweep tables (parquet requires pyarrow)')
     args = parser.parse_args()
 
+    if args.output_format == 'parquet' and pa is None:
+        parser.error('--output-format parquet requires pyarrow (pip install pyarrow)')
+
+    try:
+        grids = parse_sweep(args.sweep, args) if args.sweep else None
+    except (argparse.ArgumentTypeError, ValueError) as exc:
+        parser.error(str(exc))
+
     os.makedirs('results', exist_ok=True)
 
     print('━' * 55)
@@ -55,26 +122,55 @@ def main():
         stop_loss_pct=args.stop_loss,
         leverage=args.leverage,
     )
+
+    if grids is not None:
+        results = run_backtest_grid(df, grids['sl'], grids['pos'], grids['lev'], config)
+        rows = [
+            {
+                'Stop-Loss': r['config'].stop_loss_pct,
+                'Position': r['config'].position_size_pct,
+                'Leverage': r['config'].leverage,
+                **{k: val for k, (_, val) in r['metrics'].items()},
+            }
+            for r in results
+        ]
+        sweep_path = save_table(pd.DataFrame(rows), args.output.replace('.png', '_sweep.csv'),
+                                args.output_format)
+        print(f'  ✓ {len(results)} combinations backtested')
+        print(f'  ✓ Sweep metrics saved → {sweep_path}')
+
+        if args.sweep_reports:
+            print(f'\n  Generating draft report charts...')
+            fig = new_report_figure(draft=True)
+            for r in results:
+                c = r['config']
+                suffix = f'_sl{c.stop_loss_pct:g}_pos{c.position_size_pct:g}_lev{c.leverage:g}.png'
+                plot_full_report(r, save_path=args.output.replace('.png', suffix), fig=fig, draft=True)
+
+        print('\n  Done! ✓')
+        print('━' * 55)
+        return
+
     result = run_backtest(df, config)
 
     # 4. Print metrics
     print(f'\n[4/4] Performance Metrics:')
     print('─' * 40)
-    for k, v in result['metrics'].items():
-        print(f'  {k:<25} {v}')
+    for k, (display, _) in result['metrics'].items():
+        print(f'  {k:<25} {display}')
     print('─' * 40)
 
     # 5. Plot
     print(f'\n  Generating report chart...')
-    plot_full_report(result, save_path=args.output)
+    plot_full_report(result, save_path=args.output, draft=args.draft)
 
-    # 6. Save trades CSV
-    csv_path = args.output.replace('.png', '_trades.csv')
-    result['trades'].to_csv(csv_path, index=False)
-    print(f'  ✓ Trades CSV saved → {csv_path}')
+    # 6. Save trades / equity tables
+    trades_path = save_table(result['trades'], args.output.replace('.png', '_trades.csv'),
+                             args.output_format)
+    print(f'  ✓ Trades saved → {trades_path}')
 
-    equity_path = args.output.replace('.png', '_equity.csv')
-    result['equity'].to_csv(equity_path)
+    equity_path = save_table(result['equity'], args.output.replace('.png', '_equity.csv'),
+                             args.output_format, index=True)
     print(f'  ✓ Equity curve saved → {equity_path}')
 
     print('\n  Done! ✓')
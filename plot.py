@@ -24,7 +24,15 @@ AMBER     = '#e3b341'
 MUTED     = '#8b949e'
 WHITE     = '#e6edf3'
 
+FULL_FIGSIZE,  FULL_DPI  = (20, 24), 150
+DRAFT_FIGSIZE, DRAFT_DPI = (14, 16), 100
+
+_theme_applied = False
+
 def _apply_dark_theme():
+    global _theme_applied
+    if _theme_applied:
+        return
     plt.rcParams.update({
         'figure.facecolor':  DARK_BG,
         'axes.facecolor':    PANEL_BG,
@@ -40,6 +48,9 @@ def _apply_dark_theme():
         'legend.edgecolor':  '#30363d',
         'font.family':       'monospace',
     })
+    _theme_applied = True
+
+_apply_dark_theme()
 
 def usd_fmt(x, pos):
     return f'${x:,.0f}'
@@ -48,16 +59,33 @@ def pct_fmt(x, pos):
     return f'{x:.1%}'
 
 
-def plot_full_report(result: dict, save_path: str = 'results/backtest_report.png'):
-    """Generate a full 6-panel backtest report."""
-    _apply_dark_theme()
+def new_report_figure(draft: bool = False):
+    """Create a Figure sized for plot_full_report, for reuse across many reports."""
+    return plt.figure(figsize=DRAFT_FIGSIZE if draft else FULL_FIGSIZE, facecolor=DARK_BG)
+
+
+def plot_full_report(result: dict, save_path: str = 'results/backtest_report.png',
+                     fig=None, draft: bool = False):
+    """
+    Generate a full 6-panel backtest report.
 
+    If fig is given (see new_report_figure) it is cleared and drawn into, and
+    left open for the next report; otherwise a new Figure is created and closed.
+    draft=True renders a smaller, lower-dpi image.
+    """
     trades  = result['trades']
     equity  = result['equity']['Equity']
+    rolling_max = result['rolling_max']
+    dd      = result['drawdown']
     metrics = result['metrics']
     config  = result['config']
 
-    fig = plt.figure(figsize=(20, 24), facecolor=DARK_BG)
+    owns_fig = fig is None
+    if owns_fig:
+        fig = new_report_figure(draft)
+    else:
+        fig.clear()
+        fig.set_size_inches(DRAFT_FIGSIZE if draft else FULL_FIGSIZE)
     fig.suptitle(
         'EUR/USD · ML Signal Backtest Report',
         fontsize=22, fontweight='bold', color=WHITE, y=0.98,
@@ -80,8 +108,7 @@ def plot_full_report(result: dict, save_path: str = 'results/backtest_report.png
     ax1.plot(equity.index, equity.values, color=ACCENT, lw=1.6, label='Portfolio equity')
 
     # Drawdown shading
-    rolling_max = equity.cummax()
-    in_dd = equity < rolling_max
+    in_dd = dd.values < 0
     ax1.fill_between(equity.index, rolling_max, equity,
                      where=in_dd, alpha=0.08, color=RED, label='Drawdown')
 
@@ -97,8 +124,10 @@ def plot_full_report(result: dict, save_path: str = 'results/backtest_report.png
     ax2.set_title('Daily PnL per Trade', fontsize=13, fontweight='bold', pad=10)
 
     pnl = trades['PnL_USD']
-    colors = [GREEN if v >= 0 else RED for v in pnl]
-    ax2.bar(trades['Date'], pnl, color=colors, alpha=0.85, width=1.0)
+    pnl_arr = pnl.to_numpy()
+    # One LineCollection instead of one Rectangle patch per trade
+    ax2.vlines(trades['Date'].to_numpy(), 0, pnl_arr,
+               colors=np.where(pnl_arr >= 0, GREEN, RED), linewidth=1.0, alpha=0.85)
     ax2.axhline(0, color=MUTED, lw=0.8)
     ax2.yaxis.set_major_formatter(FuncFormatter(usd_fmt))
     ax2.xaxis.set_major_formatter(mdates.DateFormatter('%b %Y'))
@@ -110,7 +139,6 @@ def plot_full_report(result: dict, save_path: str = 'results/backtest_report.png
     ax3 = fig.add_subplot(gs[2, 0])
     ax3.set_title('Drawdown Over Time', fontsize=12, fontweight='bold', pad=10)
 
-    dd = (equity - equity.cummax()) / equity.cummax()
     ax3.fill_between(dd.index, dd.values, 0, color=RED, alpha=0.6)
     ax3.plot(dd.index, dd.values, color=RED, lw=1.0)
     ax3.yaxis.set_major_formatter(FuncFormatter(pct_fmt))
@@ -123,11 +151,17 @@ def plot_full_report(result: dict, save_path: str = 'results/backtest_report.png
     ax4 = fig.add_subplot(gs[2, 1])
     ax4.set_title('PnL Distribution', fontsize=12, fontweight='bold', pad=10)
 
-    wins  = pnl[pnl > 0]
-    loss  = pnl[pnl <= 0]
-    bins  = np.linspace(pnl.min(), pnl.max(), 40)
-    ax4.hist(loss,  bins=bins, color=RED,   alpha=0.75, label='Losses',  edgecolor='none')
-    ax4.hist(wins,  bins=bins, color=GREEN, alpha=0.75, label='Wins',    edgecolor='none')
+    # Bin once and split the counts by sign, instead of two hist() passes
+    n_bins = 39
+    bins   = np.linspace(pnl_arr.min(), pnl_arr.max(), n_bins + 1)
+    idx    = np.clip(np.searchsorted(bins, pnl_arr, side='right') - 1, 0, n_bins - 1)
+    is_win = pnl_arr > 0
+    win_counts  = np.bincount(idx[is_win],  minlength=n_bins)
+    loss_counts = np.bincount(idx[~is_win], minlength=n_bins)
+    centers = 0.5 * (bins[:-1] + bins[1:])
+    width   = bins[1] - bins[0]
+    ax4.bar(centers, loss_counts, width=width, color=RED,   alpha=0.75, label='Losses', edgecolor='none')
+    ax4.bar(centers, win_counts,  width=width, color=GREEN, alpha=0.75, label='Wins',   edgecolor='none')
     ax4.axvline(pnl.mean(), color=AMBER, lw=1.5, ls='--', label=f'Mean: ${pnl.mean():,.0f}')
     ax4.xaxis.set_major_formatter(FuncFormatter(usd_fmt))
     ax4.grid(True, alpha=0.4, axis='y')
@@ -158,23 +192,21 @@ def plot_full_report(result: dict, save_path: str = 'results/backtest_report.png
 
     def _draw_kv(ax, items, x_start):
         y = 0.95
-        for k, v in items:
+        for k, (display, val) in items:
             color = WHITE
             if 'PnL' in k or 'Return' in k or 'Win' in k or 'Profit' in k:
-                try:
-                    val = float(v.replace('$','').replace(',','').replace('%','').replace('USD',''))
-                    color = GREEN if val > 0 else RED
-                except:
-                    pass
+                color = GREEN if val > 0 else RED
             ax.text(x_start,      y, k + ':', transform=ax.transAxes,
                     fontsize=9, color=MUTED, ha='left', va='top')
-            ax.text(x_start+0.45, y, v, transform=ax.transAxes,
+            ax.text(x_start+0.45, y, display, transform=ax.transAxes,
                     fontsize=9, color=color, ha='left', va='top', fontweight='bold')
             y -= 0.13
 
     _draw_kv(ax6, col1, 0.0)
     _draw_kv(ax6, col2, 0.5)
 
-    plt.savefig(save_path, dpi=150, bbox_inches='tight', facecolor=DARK_BG)
-    plt.close(fig)
+    fig.savefig(save_path, dpi=DRAFT_DPI if draft else FULL_DPI,
+                bbox_inches='tight', facecolor=DARK_BG)
+    if owns_fig:
+        plt.close(fig)
     print(f'  ✓ Report saved → {save_path}')